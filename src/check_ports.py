@@ -1,33 +1,53 @@
+import serial
 import serial.tools.list_ports
 import sys
+from concurrent.futures import ThreadPoolExecutor
+
+def _probe_port(port) -> str:
+    """Probe a single serial port and return its status report.
+
+    Args:
+        port: Port info entry from serial.tools.list_ports.comports()
+
+    Returns:
+        str: Formatted multi-line status report for the port
+    """
+    lines = [
+        f"\nPort: {port.device}",
+        f"Description: {port.description}",
+        f"Hardware ID: {port.hwid}"
+    ]
+
+    # Try to open the port to check if it's in use
+    try:
+        ser = serial.Serial(port.device, 115200, timeout=1)
+        lines.append("Status: Available")
+        ser.close()
+    except serial.SerialException as e:
+        lines.append(f"Status: In use or unavailable ({str(e)})")
+    except Exception as e:
+        lines.append(f"Status: Error checking port ({str(e)})")
+
+    return "\n".join(lines)
 
 def check_ports():
     """Check available serial ports and their status."""
     print("\nChecking available serial ports...")
-    
+
     ports = list(serial.tools.list_ports.comports())
-    
+
     if not ports:
         print("No serial ports found!")
         return
-    
+
     print("\nAvailable ports:")
     print("---------------")
-    
-    for port in ports:
-        print(f"\nPort: {port.device}")
-        print(f"Description: {port.description}")
-        print(f"Hardware ID: {port.hwid}")
-        
-        # Try to open the port to check if it's in use
-        try:
-            ser = serial.Serial(port.device, 115200, timeout=1)
-            print("Status: Available")
-            ser.close()
-        except serial.SerialException as e:
-            print(f"Status: In use or unavailable ({str(e)})")
-        except Exception as e:
-            print(f"Status: Error checking port ({str(e)})")
+
+    # Probe all ports concurrently: each probe is I/O-bound and a single
+    # wedged port would otherwise stall every port behind it
+    with ThreadPoolExecutor(max_workers=len(ports)) as executor:
+        for report in executor.map(_probe_port, ports):
+            print(report)
 
 if __name__ == "__main__":
     try:
@@ -1,46 +1,125 @@
+import math
 import numpy as np
 from typing import List, Tuple
 import mediapipe as mp
 from dataclasses import dataclass
 
+try:
+    from numba import njit
+except ImportError:  # Numba is optional; fall back to plain Python
+    njit = None
+
+# Landmark indices of each finger tip, fixed by MediaPipe's hand topology
+TIP_IDX = np.array([4, 8, 12, 16, 20])
+
+# (PIP, MCP) joint indices per finger used for the segment-angle computation
+# (the thumb uses its IP/MCP joints)
+ANGLE_PIP_IDX = np.array([3, 7, 11, 15, 19])
+ANGLE_MCP_IDX = np.array([2, 6, 10, 14, 18])
+
+def _finger_angles(arr: np.ndarray, out: np.ndarray) -> np.ndarray:
+    """Compute the five finger segment angles in degrees.
+
+    Flattened scalar math keeps the per-finger work free of NumPy call
+    dispatch, which dominates on 2-element vectors.
+
+    Args:
+        arr: (21, 2) array of normalized landmark (x, y) coordinates
+        out: Preallocated 5-element output array
+
+    Returns:
+        np.ndarray: out, filled with the angle in degrees per finger
+    """
+    for i in range(5):
+        tip = TIP_IDX[i]
+        pip = ANGLE_PIP_IDX[i]
+        mcp = ANGLE_MCP_IDX[i]
+        dx1 = arr[pip, 0] - arr[mcp, 0]
+        dy1 = arr[pip, 1] - arr[mcp, 1]
+        dx2 = arr[tip, 0] - arr[pip, 0]
+        dy2 = arr[tip, 1] - arr[pip, 1]
+        denom = math.sqrt(
+            (dx1 * dx1 + dy1 * dy1) * (dx2 * dx2 + dy2 * dy2))
+        if denom == 0.0:
+            # Coincident landmarks give a zero-length segment; report a
+            # zero angle instead of dividing by zero
+            out[i] = 0.0
+            continue
+        cos_angle = (dx1 * dx2 + dy1 * dy2) / denom
+        out[i] = math.degrees(math.acos(min(1.0, max(-1.0, cos_angle))))
+    return out
+
+if njit is not None:
+    _finger_angles = njit(cache=True, fastmath=True)(_finger_angles)
+
+# Warm up on a dummy frame so JIT compilation happens at import time
+# rather than on the first camera frame
+_finger_angles(np.arange(42, dtype=np.float32).reshape(21, 2), np.empty(5))
+
+# Precomputed 5-bit strings indexed by packed finger bits
+_BINSTR = tuple(format(i, '05b') for i in range(32))
+
 @dataclass
 class FingerState:
-    """Represents the state of all fingers."""
-    thumb: bool = False
-    index: bool = False
-    middle: bool = False
-    ring: bool = False
-    pinky: bool = False
-    
+    """Represents the state of all fingers as a packed 5-bit mask.
+
+    Bit layout: thumb is bit 4 (highest), pinky is bit 0. Storing one
+    integer instead of five booleans makes equality an int compare and
+    keeps instances small.
+    """
+    bits: np.uint8 = np.uint8(0)
+
+    @property
+    def thumb(self) -> bool:
+        return bool(self.bits >> 4 & 1)
+
+    @property
+    def index(self) -> bool:
+        return bool(self.bits >> 3 & 1)
+
+    @property
+    def middle(self) -> bool:
+        return bool(self.bits >> 2 & 1)
+
+    @property
+    def ring(self) -> bool:
+        return bool(self.bits >> 1 & 1)
+
+    @property
+    def pinky(self) -> bool:
+        return bool(self.bits & 1)
+
     def to_binary(self) -> str:
         """Convert finger states to binary string.
-        
+
         Returns:
             str: Binary string where 1 = open, 0 = closed
                  Order: thumb, index, middle, ring, pinky
         """
-        return "".join(["1" if state else "0" for state in 
-                       [self.thumb, self.index, self.middle, self.ring, self.pinky]])
-    
+        return _BINSTR[int(self.bits) & 0x1F]
+
+    def to_byte(self) -> bytes:
+        """Pack the state into a single framed byte for the ESP32.
+
+        Returns:
+            bytes: One byte whose set MSB marks the frame start and
+                   whose low five bits carry the finger states
+        """
+        return bytes([int(self.bits) & 0x1F | 0x80])
+
     @classmethod
     def from_binary(cls, binary: str) -> 'FingerState':
         """Create FingerState from binary string.
-        
+
         Args:
             binary (str): Binary string (e.g., "10110")
-            
+
         Returns:
             FingerState: New instance with specified states
         """
         if len(binary) != 5 or not all(c in '01' for c in binary):
             raise ValueError("Invalid binary string")
-        return cls(
-            thumb=binary[0] == '1',
-            index=binary[1] == '1',
-            middle=binary[2] == '1',
-            ring=binary[3] == '1',
-            pinky=binary[4] == '1'
-        )
+        return cls(bits=np.uint8(int(binary, 2)))
 
 class HandLandmarkDetector:
     """Detects and analyzes hand landmarks using MediaPipe."""
@@ -54,114 +133,106 @@ class HandLandmarkDetector:
             min_detection_confidence=0.7,
             min_tracking_confidence=0.5
         )
-        
+
+        # Per-frame scratch buffers; process_frame runs on one thread at
+        # a time, so reusing them keeps the hot path allocation-free
+        self._lm_buf = np.empty((21, 2), dtype=np.float32)
+        self._angles_buf = np.empty(5)
+
+    def _landmarks_to_array(self, landmarks) -> np.ndarray:
+        """Copy MediaPipe landmarks into the reusable (21, 2) float32 buffer.
+
+        Args:
+            landmarks: MediaPipe hand landmarks
+
+        Returns:
+            np.ndarray: (21, 2) array of normalized (x, y) coordinates
+        """
+        buf = self._lm_buf
+        for i, p in enumerate(landmarks):
+            buf[i, 0] = p.x
+            buf[i, 1] = p.y
+        return buf
+
     def detect_finger_states(self, landmarks) -> FingerState:
         """Determine which fingers are open based on hand landmarks.
-        
+
         Args:
-            landmarks: MediaPipe hand landmarks
-            
+            landmarks: (21, 2) array of normalized landmark (x, y) coordinates
+
         Returns:
             FingerState: Current state of all fingers
         """
-        if not landmarks:
+        if landmarks is None:
             return FingerState()
-            
-        finger_state = FingerState()
-        
-        # Thumb: Compare x-coordinates of tip and IP joint
-        finger_state.thumb = landmarks[4].x < landmarks[3].x
-        
-        # Other fingers: Compare y-coordinates of tip and PIP joints
-        fingers = {
-            'index': (8, 6),   # Tip, PIP
-            'middle': (12, 10),
-            'ring': (16, 14),
-            'pinky': (20, 18)
-        }
-        
-        for finger, (tip_idx, pip_idx) in fingers.items():
-            # Finger is considered open if tip is above PIP joint
-            is_open = landmarks[tip_idx].y < landmarks[pip_idx].y
-            setattr(finger_state, finger, is_open)
-            
-        return finger_state
-    
+
+        # Fully unrolled: the tip/joint pairing is fixed by MediaPipe's
+        # topology, and for five elements scalar indexing beats building
+        # fancy-indexed temporaries. The thumb opens along x (tip left of
+        # IP joint), the other fingers along y (tip above PIP joint)
+        bits = ((landmarks[4, 0] < landmarks[3, 0]) << 4 |
+                (landmarks[8, 1] < landmarks[6, 1]) << 3 |
+                (landmarks[12, 1] < landmarks[10, 1]) << 2 |
+                (landmarks[16, 1] < landmarks[14, 1]) << 1 |
+                (landmarks[20, 1] < landmarks[18, 1]))
+        return FingerState(bits=np.uint8(bits))
+
     def get_hand_position(self, landmarks) -> Tuple[float, float]:
         """Calculate the center position of the hand.
-        
+
         Args:
-            landmarks: MediaPipe hand landmarks
-            
+            landmarks: (21, 2) array of normalized landmark (x, y) coordinates
+
         Returns:
             Tuple[float, float]: (x, y) coordinates of hand center
         """
-        if not landmarks:
+        if landmarks is None:
             return (0.0, 0.0)
-            
+
         # Calculate average position of all landmarks
-        x_coords = [lm.x for lm in landmarks]
-        y_coords = [lm.y for lm in landmarks]
-        
-        return (np.mean(x_coords), np.mean(y_coords))
-    
+        center = landmarks.mean(axis=0)
+        return (float(center[0]), float(center[1]))
+
     def get_finger_angles(self, landmarks) -> List[float]:
         """Calculate angles between finger segments.
-        
+
         Args:
-            landmarks: MediaPipe hand landmarks
-            
+            landmarks: (21, 2) array of normalized landmark (x, y) coordinates
+
         Returns:
             List[float]: Angles in degrees for each finger
         """
-        if not landmarks:
+        if landmarks is None:
             return [0.0] * 5
-            
-        angles = []
-        # Finger triplet points (tip, PIP, MCP)
-        finger_points = [
-            (4, 3, 2),    # Thumb
-            (8, 7, 6),    # Index
-            (12, 11, 10), # Middle
-            (16, 15, 14), # Ring
-            (20, 19, 18)  # Pinky
-        ]
-        
-        for tip, pip, mcp in finger_points:
-            # Get vectors
-            v1 = np.array([landmarks[pip].x - landmarks[mcp].x,
-                          landmarks[pip].y - landmarks[mcp].y])
-            v2 = np.array([landmarks[tip].x - landmarks[pip].x,
-                          landmarks[tip].y - landmarks[pip].y])
-            
-            # Calculate angle
-            cos_angle = np.dot(v1, v2) / (np.linalg.norm(v1) * np.linalg.norm(v2))
-            angle = np.arccos(np.clip(cos_angle, -1.0, 1.0))
-            angles.append(np.degrees(angle))
-            
-        return angles
+
+        return _finger_angles(landmarks, self._angles_buf).tolist()
         
-    def process_frame(self, frame) -> Tuple[FingerState, List[float], Tuple[float, float]]:
+    def process_frame(self, frame) -> Tuple[FingerState, List[float], Tuple[float, float], bool]:
         """Process a frame and return hand analysis results.
-        
+
         Args:
             frame: RGB image frame
-            
+
         Returns:
             Tuple containing:
             - FingerState: Current state of fingers
             - List[float]: Angles of each finger
             - Tuple[float, float]: Hand position (x, y)
+            - bool: Whether a hand was detected in the frame
         """
         results = self.hands.process(frame)
-        
+
         if not results.multi_hand_landmarks:
-            return FingerState(), [0.0] * 5, (0.0, 0.0)
+            return FingerState(), [0.0] * 5, (0.0, 0.0), False
             
         landmarks = results.multi_hand_landmarks[0].landmark
-        
-        finger_state = self.detect_finger_states(landmarks)
-        angles = self.get_finger_angles(landmarks)
-        position = self.get_hand_position(landmarks)
-        
-        return finger_state, angles, position
\ No newline at end of file
+
+        # Extract all 21 landmarks into one array so the helpers below share
+        # a single pass over the MediaPipe protobuf objects
+        lm_np = self._landmarks_to_array(landmarks)
+
+        finger_state = self.detect_finger_states(lm_np)
+        angles = self.get_finger_angles(lm_np)
+        position = self.get_hand_position(lm_np)
+
+        return finger_state, angles, position, True
\ No newline at end of file
@@ -2,26 +2,119 @@ import cv2
 import numpy as np
 import serial
 import serial.tools.list_ports
+import threading
+import queue
 import time
 import os
-from hand_tracker import HandLandmarkDetector
+from hand_tracker import HandLandmarkDetector, FingerState
 from visualizer import HandVisualizer
 
+# Shorter frame edge fed to MediaPipe; inference cost scales with pixel
+# count and landmarks are normalized, so display resolution is unaffected
+PROCESS_SHORT_EDGE = 320
+
+# Consecutive detections that must agree before a new state is sent to
+# the ESP32, suppressing transient flips from MediaPipe jitter that
+# would otherwise chatter the servos
+DEBOUNCE_FRAMES = 3
+
+class _LatestSlot:
+    """Thread-safe holder carrying only the newest value of a stream.
+
+    put() overwrites any unconsumed value, so neither side ever waits on
+    a backlog; take() blocks until a fresh value arrives, take_nowait()
+    returns it or None.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._value = None
+        self._fresh = False
+
+    def put(self, value):
+        """Store a value, returning any unconsumed one it displaced.
+
+        Returns:
+            The previously stored value if it was never taken, else None.
+            Callers that pool buffers use this to reclaim ownership.
+        """
+        with self._cond:
+            displaced = self._value if self._fresh else None
+            self._value = value
+            self._fresh = True
+            self._cond.notify()
+            return displaced
+
+    def take(self):
+        """Block until a fresh value arrives, then return it."""
+        with self._cond:
+            while not self._fresh:
+                self._cond.wait()
+            self._fresh = False
+            return self._value
+
+    def take_nowait(self):
+        """Return the newest unconsumed value, or None if there is none."""
+        with self._cond:
+            if not self._fresh:
+                return None
+            self._fresh = False
+            return self._value
+
 class HandTrackingApp:
-    def __init__(self, camera_id: int = 0, serial_port: str = 'COM8', baud_rate: int = 115200, retry_count: int = 3):
+    def __init__(self, camera_id: int = 0, serial_port: str = 'COM8', baud_rate: int = 115200, retry_count: int = 3,
+                 process_every: int = 2):
         """Initialize the hand tracking application.
-        
+
         Args:
             camera_id (int): Camera device ID (default: 0 for primary camera)
             serial_port (str): Serial port for ESP32 communication
             baud_rate (int): Serial communication baud rate
             retry_count (int): Number of connection retries
+            process_every (int): Run hand detection on every Nth frame;
+                intermediate frames reuse the last results
         """
         # Initialize camera
         self.cap = cv2.VideoCapture(camera_id)
         if not self.cap.isOpened():
             raise RuntimeError("Could not open camera")
-            
+
+        # Keep the driver queue at one frame so a processing stall can't
+        # build a backlog of stale frames, and prefer MJPG to reduce USB
+        # bandwidth (both are best-effort; not every backend honors them)
+        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
+
+        # Compute the downscaled size used for detection
+        width = self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)
+        height = self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT)
+        if min(width, height) > PROCESS_SHORT_EDGE:
+            scale = PROCESS_SHORT_EDGE / min(width, height)
+            self.process_size = (int(round(width * scale)),
+                                 int(round(height * scale)))
+        else:
+            self.process_size = None  # Camera already small enough
+
+        # Pool of RGB conversion buffers shared with the inference
+        # thread (grown lazily to two once the frame size is known). A
+        # buffer re-enters the pool only after the worker has finished
+        # with it or the input slot displaced it unread, so the loop
+        # never overwrites a frame the worker is still reading
+        self._free_bufs = []
+        self._buf_lock = threading.Lock()
+        self._buf_count = 0
+
+        # Detection frame skipping: MediaPipe dominates loop cost and
+        # finger state rarely changes between adjacent frames
+        self.process_every = max(1, process_every)
+        self._last_results = (FingerState(), [0.0] * 5, (0.0, 0.0), False)
+
+        # MediaPipe runs on its own thread fed through latest-value
+        # slots, letting capture and rendering overlap with inference
+        self._in_slot = _LatestSlot()
+        self._out_slot = _LatestSlot()
+        threading.Thread(target=self._inference_worker, daemon=True).start()
+
         # Initialize components
         self.detector = HandLandmarkDetector()
         self.visualizer = HandVisualizer()
@@ -31,6 +124,18 @@ class HandTrackingApp:
         self.baud_rate = baud_rate
         self.serial = None
         
+        # Status overlay text/color pairs, indexed by connection state
+        self._status_overlay = {
+            True: ("ESP32: Connected", (0, 255, 0)),
+            False: ("ESP32: Disconnected", (0, 0, 255))
+        }
+
+        # Serial writes happen on a background thread so blocking I/O and
+        # reconnect stalls never hold up the render loop; the one-slot
+        # queue always carries only the most recent state
+        self._tx_q = queue.Queue(maxsize=1)
+        threading.Thread(target=self._serial_worker, daemon=True).start()
+
         # Try to establish serial connection
         self.connect_to_esp32(retry_count)
             
@@ -72,8 +177,8 @@ class HandTrackingApp:
                 print("Waiting for ESP32 to initialize...")
                 time.sleep(2)
                 
-                # Test communication
-                self.serial.write(b"00000\n")
+                # Test communication with an all-closed framed byte
+                self.serial.write(FingerState().to_byte())
                 response = self.serial.readline().decode().strip()
                 print(f"ESP32 response: {response}")
                 
@@ -97,26 +202,60 @@ class HandTrackingApp:
         print("Running in camera-only mode")
         return False
         
-    def send_to_esp32(self, finger_state: str):
-        """Send finger state to ESP32.
-        
+    def send_to_esp32(self, finger_state: FingerState):
+        """Queue finger state for transmission to the ESP32.
+
         Args:
-            finger_state (str): Binary string of finger states (e.g., "10110")
+            finger_state (FingerState): State to transmit as one framed byte
         """
-        if self.serial and self.serial.is_open:
+        # Drop any stale queued state so the worker sends the newest one
+        try:
+            self._tx_q.get_nowait()
+        except queue.Empty:
+            pass
+        self._tx_q.put_nowait(finger_state)
+
+    def _inference_worker(self):
+        """Background thread running MediaPipe on the newest queued frame."""
+        while True:
+            frame_rgb = self._in_slot.take()
             try:
-                # Add newline character for ESP32 parsing
-                data = finger_state + '\n'
-                bytes_written = self.serial.write(data.encode())
-                self.serial.flush()  # Ensure data is sent
-                
-                print(f"Sent to ESP32: {finger_state} ({bytes_written} bytes)")
-                
-                # Read ESP32 response with timeout
+                results = self.detector.process_frame(frame_rgb)
+            except Exception as e:
+                # Keep the worker alive: one bad frame must not silently
+                # end detection for the rest of the session
+                print(f"Hand detection error: {e}")
+                results = None
+            finally:
+                # Hand the buffer back to the pool for reuse
+                with self._buf_lock:
+                    self._free_bufs.append(frame_rgb)
+            if results is not None:
+                self._out_slot.put(results)
+
+    def _serial_worker(self):
+        """Background thread that performs the blocking serial I/O."""
+        while True:
+            finger_state = self._tx_q.get()
+
+            if not (self.serial and self.serial.is_open):
+                continue
+
+            try:
+                # Single framed byte: MSB marks the frame, low five bits
+                # carry the finger states. No flush: the protocol is
+                # fire-and-forget and the OS pushes a lone byte promptly
+                bytes_written = self.serial.write(finger_state.to_byte())
+
+                print(f"Sent to ESP32: {finger_state.to_binary()} "
+                      f"({bytes_written} byte)")
+
+                # Drain whatever the ESP32 has sent without ever blocking
                 if self.serial.in_waiting:
-                    response = self.serial.readline().decode().strip()
-                    print(f"ESP32 Response: {response}")
-                    
+                    response = self.serial.read(self.serial.in_waiting)
+                    print(f"ESP32 Response: "
+                          f"{response.decode(errors='replace').strip()}")
+
             except serial.SerialException as e:
                 print(f"Serial communication error: {e}")
                 print("Attempting to reconnect...")
@@ -134,6 +273,9 @@ class HandTrackingApp:
             
             show_debug = False
             last_state = ""
+            last_bits = -1
+            pending_bits = -1
+            pending_count = 0
             frame_count = 0
             
             while True:
@@ -143,31 +285,75 @@ class HandTrackingApp:
                     print("Failed to grab frame")
                     break
                 
-                # Convert frame to RGB for MediaPipe
-                frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                
-                # Process frame
-                finger_state, angles, position = self.detector.process_frame(frame_rgb)
-                
-                # Get binary state
-                binary_state = finger_state.to_binary()
+                # Feed detection only every Nth frame; the inference
+                # thread works on the newest fed frame while capture and
+                # rendering continue, and intermediate frames reuse the
+                # last results so the video stays smooth
+                if frame_count % self.process_every == 0:
+                    # Downscale for detection; the original frame is only
+                    # needed for visualization
+                    if self.process_size is not None:
+                        small = cv2.resize(frame, self.process_size,
+                                           interpolation=cv2.INTER_AREA)
+                    else:
+                        small = frame
+
+                    # Convert frame to RGB for MediaPipe into a pooled
+                    # buffer; with both buffers still in flight the worker
+                    # is saturated and this frame is simply skipped
+                    with self._buf_lock:
+                        rgb_buf = (self._free_bufs.pop()
+                                   if self._free_bufs else None)
+                    if rgb_buf is None and self._buf_count < 2:
+                        rgb_buf = np.empty_like(small)
+                        self._buf_count += 1
+                    if rgb_buf is not None:
+                        cv2.cvtColor(small, cv2.COLOR_BGR2RGB, dst=rgb_buf)
+                        displaced = self._in_slot.put(rgb_buf)
+                        if displaced is not None:
+                            with self._buf_lock:
+                                self._free_bufs.append(displaced)
                 
-                # Only send if state has changed
-                if binary_state != last_state:
-                    self.send_to_esp32(binary_state)
-                    last_state = binary_state
+                # Pick up the newest finished detection, if any
+                fresh_results = self._out_slot.take_nowait()
+                if fresh_results is not None:
+                    self._last_results = fresh_results
+
+                finger_state, angles, position, detected = self._last_results
+
+                # Debounce: send only once DEBOUNCE_FRAMES consecutive
+                # detections agree on a state different from the last one
+                # sent
+                if fresh_results is not None:
+                    bits = finger_state.bits
+                    if bits == pending_bits:
+                        pending_count += 1
+                    else:
+                        pending_bits = bits
+                        pending_count = 1
+                    if pending_count >= DEBOUNCE_FRAMES and bits != last_bits:
+                        last_bits = bits
+                        last_state = finger_state.to_binary()
+                        self.send_to_esp32(finger_state)
                 
-                # Create visualization
-                output_frame = self.visualizer.create_visualization(
-                    frame.copy(),
-                    finger_state,
-                    angles,
-                    position
-                )
+                # Draw the visualization directly into the captured frame:
+                # nothing reads it after imshow and cap.read() hands back a
+                # fresh buffer, so the defensive copy was pure overhead.
+                # With no hand in view skip the per-component drawing and
+                # just show the title and status overlays
+                if detected:
+                    output_frame = self.visualizer.create_visualization(
+                        frame,
+                        finger_state,
+                        angles,
+                        position
+                    )
+                else:
+                    output_frame = self.visualizer.draw_title(frame)
                 
-                # Add ESP32 connection status
-                status = "ESP32: Connected" if (self.serial and self.serial.is_open) else "ESP32: Disconnected"
-                color = (0, 255, 0) if (self.serial and self.serial.is_open) else (0, 0, 255)
+                # Add ESP32 connection status; check is_open once per frame
+                connected = bool(self.serial and self.serial.is_open)
+                status, color = self._status_overlay[connected]
                 cv2.putText(output_frame, status,
                            (output_frame.shape[1] - 200, output_frame.shape[0] - 20),
                            cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2)
@@ -177,9 +363,9 @@ class HandTrackingApp:
                     debug_info = [
                         f"Frame: {frame_count}",
                         f"Last State: {last_state}",
-                        f"Current State: {binary_state}",
+                        f"Current State: {finger_state.to_binary()}",
                         f"Serial Port: {self.serial_port}",
-                        f"Serial Connected: {bool(self.serial and self.serial.is_open)}"
+                        f"Serial Connected: {connected}"
                     ]
                     for i, info in enumerate(debug_info):
                         cv2.putText(output_frame, info,
@@ -200,9 +386,9 @@ class HandTrackingApp:
                     show_debug = not show_debug
                 elif key == ord('t'):
                     print("\nTesting ESP32 communication...")
-                    self.send_to_esp32("11111")
+                    self.send_to_esp32(FingerState.from_binary("11111"))
                     time.sleep(0.5)
-                    self.send_to_esp32("00000")
+                    self.send_to_esp32(FingerState.from_binary("00000"))
                     
                 frame_count += 1
                     
@@ -235,7 +421,9 @@ def main():
                        help='Baud rate for serial communication (default: 115200)')
     parser.add_argument('--retry', type=int, default=3,
                        help='Number of connection retries (default: 3)')
-    
+    parser.add_argument('--process-every', type=int, default=2,
+                       help='Run hand detection on every Nth frame (default: 2)')
+
     args = parser.parse_args()
     
     try:
@@ -243,7 +431,8 @@ def main():
             camera_id=args.camera,
             serial_port=args.port,
             baud_rate=args.baud,
-            retry_count=args.retry
+            retry_count=args.retry,
+            process_every=args.process_every
         )
         app.run()
         
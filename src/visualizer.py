@@ -19,6 +19,13 @@ class HandVisualizer:
         self.font = cv2.FONT_HERSHEY_SIMPLEX
         self.font_scale = 0.6
         self.thickness = 2
+
+        # Static text and layout, computed once instead of per frame
+        self._finger_attrs = ('thumb', 'index', 'middle', 'ring', 'pinky')
+        self._finger_names = [f.capitalize() for f in self._finger_attrs]
+        self._finger_dot_positions = [(20, 50 + i * 30) for i in range(5)]
+        self._finger_label_positions = [(40, 55 + i * 30) for i in range(5)]
+        self._angle_prefixes = [f"Angle {i + 1}: " for i in range(5)]
         
     def draw_finger_states(self, frame: np.ndarray, 
                           finger_state: FingerState,
@@ -33,27 +40,20 @@ class HandVisualizer:
         Returns:
             np.ndarray: Frame with finger state visualization
         """
-        h, w = frame.shape[:2]
-        x, y = int(position[0] * w), int(position[1] * h)
-        
         # Draw finger state indicators
-        fingers = ['thumb', 'index', 'middle', 'ring', 'pinky']
-        spacing = 30
-        
-        for i, finger in enumerate(fingers):
+        for i, finger in enumerate(self._finger_attrs):
             state = getattr(finger_state, finger)
             color = self.colors['open'] if state else self.colors['closed']
-            pos = (20, 50 + i * spacing)
-            
+
             # Draw circle indicator
-            cv2.circle(frame, (pos[0], pos[1]), 8, color, -1)
-            
+            cv2.circle(frame, self._finger_dot_positions[i], 8, color, -1)
+
             # Draw finger name
-            cv2.putText(frame, finger.capitalize(), 
-                       (pos[0] + 20, pos[1] + 5),
-                       self.font, self.font_scale, self.colors['text'], 
+            cv2.putText(frame, self._finger_names[i],
+                       self._finger_label_positions[i],
+                       self.font, self.font_scale, self.colors['text'],
                        self.thickness)
-        
+
         return frame
     
     def draw_binary_state(self, frame: np.ndarray, 
@@ -89,16 +89,14 @@ class HandVisualizer:
         Returns:
             np.ndarray: Frame with angle visualization
         """
-        h, w = frame.shape[:2]
-        x, y = int(position[0] * w), int(position[1] * h)
-        
+        w = frame.shape[1]
+
         # Draw angle values
         for i, angle in enumerate(angles):
-            pos = (w - 150, 50 + i * 30)
-            cv2.putText(frame, f"Angle {i+1}: {angle:.1f}°",
-                       pos, self.font, self.font_scale,
+            cv2.putText(frame, self._angle_prefixes[i] + f"{angle:5.1f}\u00b0",
+                       (w - 150, 50 + i * 30), self.font, self.font_scale,
                        self.colors['text'], self.thickness)
-        
+
         return frame
     
     def draw_hand_position(self, frame: np.ndarray,
@@ -149,10 +147,21 @@ class HandVisualizer:
         frame = self.draw_binary_state(frame, finger_state)
         frame = self.draw_angles(frame, angles, position)
         frame = self.draw_hand_position(frame, position)
-        
-        # Add title
+        frame = self.draw_title(frame)
+
+        return frame
+
+    def draw_title(self, frame: np.ndarray) -> np.ndarray:
+        """Draw the application title.
+
+        Args:
+            frame (np.ndarray): Input frame
+
+        Returns:
+            np.ndarray: Frame with title text
+        """
         cv2.putText(frame, "Hand Tracking Visualization",
                    (20, 30), self.font, 1.0,
                    self.colors['text'], self.thickness)
-        
+
         return frame
\ No newline at end of file